@@ -15,10 +15,69 @@
 """Logging utilities for composition functions."""
 
 import enum
+import json
 import logging
 
 import structlog
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj, default=None) -> bytes:
+    try:
+        return orjson.dumps(
+            obj,
+            default=default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+    except TypeError:
+        # orjson rejects some things the json module accepts, like integers
+        # that don't fit in 64 bits. A log call must never raise, so fall back.
+        return json.dumps(obj, default=default).encode()
+
+
+def _drop(logger, method_name, event_dict):  # noqa: ARG001  # We need this signature.
+    raise structlog.DropEvent
+
+
+# The processor pipelines for each log level. They're built once at import time
+# so configure only needs to pick one.
+_DISABLED_PROCESSORS = (_drop,)
+
+# Callsite parameters are only added to debug logs. Finding them requires
+# walking the stack for every log line, which is too expensive in production.
+_DEBUG_PROCESSORS = (
+    structlog.processors.add_log_level,
+    structlog.processors.CallsiteParameterAdder(
+        {
+            structlog.processors.CallsiteParameter.FILENAME,
+            structlog.processors.CallsiteParameter.LINENO,
+        }
+    ),
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.dev.ConsoleRenderer(),
+)
+
+# Use orjson to render log lines if it's installed. It's much faster than the
+# stdlib json module, and produces bytes we can write directly.
+_JSON_RENDERER = structlog.processors.JSONRenderer()
+_JSON_LOGGER_FACTORY = structlog.WriteLoggerFactory()
+if orjson is not None:
+    _JSON_RENDERER = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    _JSON_LOGGER_FACTORY = structlog.BytesLoggerFactory()
+
+# Attempt to match function-sdk-go's production logger.
+_PRODUCTION_PROCESSORS = (
+    structlog.processors.add_log_level,
+    structlog.processors.dict_tracebacks,
+    structlog.processors.TimeStamper(key="ts"),
+    structlog.processors.EventRenamer(to="msg"),
+    _JSON_RENDERER,
+)
+
 
 class Level(enum.Enum):
     """Supported log levels."""
@@ -28,6 +87,10 @@ class Level(enum.Enum):
     INFO = 2
 
 
+# The level logging was last configured at, if any.
+_configured_level: Level | None = None
+
+
 def configure(level: Level = Level.INFO) -> None:
     """Configure logging.
 
@@ -37,51 +100,46 @@ def configure(level: Level = Level.INFO) -> None:
     Must be called before calling get_logger. When debug logging is enabled logs
     will be printed in a human readable fashion. When not enabled, logs will be
     printed as JSON lines.
-    """
-
-    def dropper(logger, method_name, event_dict):  # noqa: ARG001  # We need this signature.
-        raise structlog.DropEvent
 
-    if level == Level.DISABLED:
-        structlog.configure(processors=[dropper])
-        return
-
-    processors = [
-        structlog.stdlib.add_log_level,
-        structlog.processors.CallsiteParameterAdder(
-            {
-                structlog.processors.CallsiteParameter.FILENAME,
-                structlog.processors.CallsiteParameter.LINENO,
-            }
-        ),
-    ]
-
-    if level == Level.DEBUG:
-        structlog.configure(
-            processors=[
-                *processors,
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.dev.ConsoleRenderer(),
-            ]
-        )
+    Loggers are cached the first time they're used. Calling configure again
+    won't affect a logger that has already been used to emit a log line.
+    Calling configure again with the level it's already configured at is a
+    no-op.
+    """
+    global _configured_level  # noqa: PLW0603  # We need to track configuration.
+    if _configured_level is level:
         return
-
-    # Attempt to match function-sdk-go's production logger.
-    structlog.configure(
-        processors=[
-            *processors,
-            structlog.processors.dict_tracebacks,
-            structlog.processors.TimeStamper(key="ts"),
-            structlog.processors.EventRenamer(to="msg"),
-            structlog.processors.JSONRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
-    )
-
-
-def get_logger() -> structlog.stdlib.BoundLogger:
+    _configured_level = level
+
+    match level:
+        case Level.DISABLED:
+            # Filter out everything below critical, so most log calls return
+            # before any processors run. There's no filtering logger above
+            # critical, so critical logs are still dropped by a processor.
+            structlog.configure(
+                processors=_DISABLED_PROCESSORS,
+                wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL),
+                cache_logger_on_first_use=True,
+            )
+        case Level.DEBUG:
+            structlog.configure(
+                processors=_DEBUG_PROCESSORS,
+                wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG),
+                logger_factory=structlog.WriteLoggerFactory(),
+                cache_logger_on_first_use=True,
+            )
+        case _:
+            structlog.configure(
+                processors=_PRODUCTION_PROCESSORS,
+                wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+                logger_factory=_JSON_LOGGER_FACTORY,
+                cache_logger_on_first_use=True,
+            )
+
+
+def get_logger() -> structlog.types.FilteringBoundLogger:
     """Get a logger.
 
     You must call configure before calling get_logger.
     """
-    return structlog.stdlib.get_logger()
+    return structlog.get_logger()
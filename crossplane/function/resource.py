@@ -16,6 +16,7 @@
 
 import dataclasses
 import datetime
+import functools
 
 import pydantic
 from google.protobuf import struct_pb2 as structpb
@@ -66,10 +67,44 @@ def dict_to_struct(d: dict) -> structpb.Struct:
     struct in a RunFunctionResponse.
     """
     s = structpb.Struct()
-    s.update(d)
+    if d:
+        _update_struct(s, d)
     return s
 
 
+def _update_struct(s: structpb.Struct, d: dict) -> None:
+    # Struct.update handles everything, but is slow for lists because it
+    # type-checks every element. Handle non-empty lists and dicts (which may
+    # contain lists) ourselves, and let Struct.update handle the rest.
+    for k, v in d.items():
+        if isinstance(v, dict) and v:
+            _update_struct(s.fields[k].struct_value, v)
+        elif isinstance(v, list) and v:
+            _extend_list(s.fields[k].list_value, v)
+        else:
+            s[k] = v
+
+
+def _extend_list(lv: structpb.ListValue, items: list) -> None:
+    add = lv.values.add
+    t = type(items[0])
+    if t is str and all(type(x) is str for x in items):
+        for x in items:
+            add().string_value = x
+        return
+    if t in (int, float) and all(type(x) in (int, float) for x in items):
+        for x in items:
+            add().number_value = x
+        return
+    for x in items:
+        if isinstance(x, dict) and x:
+            _update_struct(add().struct_value, x)
+        elif isinstance(x, list) and x:
+            _extend_list(add().list_value, x)
+        else:
+            lv.append(x)
+
+
 def struct_to_dict(s: structpb.Struct) -> dict:
     """Create a dict from the supplied Struct well-known type.
 
@@ -83,7 +118,7 @@ def struct_to_dict(s: structpb.Struct) -> dict:
     }
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Condition:
     """A status condition."""
 
@@ -115,38 +150,62 @@ def get_condition(resource: structpb.Struct, typ: str) -> Condition:
 
     A status condition is always returned. If the status condition isn't present
     in the supplied resource, a condition with status "Unknown" is returned.
+    The same is true if the resource's status isn't an object, or its conditions
+    aren't a list. A condition with no status also has status "Unknown". Any
+    reason or message that isn't a string is ignored.
     """
     unknown = Condition(typ=typ, status="Unknown")
 
-    if not resource or "status" not in resource:
+    # Walk the Struct's fields directly. This finds the condition without
+    # converting the rest of the resource to Python values.
+    status = resource.fields.get("status") if resource else None
+    if status is None or status.WhichOneof("kind") != "struct_value":
         return unknown
 
-    if not resource["status"] or "conditions" not in resource["status"]:
+    conditions = status.struct_value.fields.get("conditions")
+    if conditions is None or conditions.WhichOneof("kind") != "list_value":
+        return unknown
+
+    c = next(
+        (
+            v.struct_value.fields
+            for v in conditions.list_value.values
+            if _get_string(v.struct_value.fields, "type") == typ
+        ),
+        None,
+    )
+    if c is None:
         return unknown
 
-    for c in resource["status"]["conditions"]:
-        if c["type"] != typ:
-            continue
+    cs = _get_string(c, "status")
+    condition = Condition(
+        typ=typ,
+        status=cs if cs is not None else "Unknown",
+        reason=_get_string(c, "reason"),
+        message=_get_string(c, "message"),
+    )
+    ltt = _get_string(c, "lastTransitionTime")
+    if ltt is not None:
+        condition.last_transition_time = _parse_time(ltt)
+
+    return condition
+
 
-        condition = Condition(
-            typ=c["type"],
-            status=c["status"],
-        )
-        if "message" in c:
-            condition.message = c["message"]
-        if "reason" in c:
-            condition.reason = c["reason"]
-        if "lastTransitionTime" in c:
-            condition.last_transition_time = datetime.datetime.fromisoformat(
-                c["lastTransitionTime"]
-            )
+def _get_string(fields, key: str) -> str | None:
+    v = fields.get(key)
+    if v is None or v.WhichOneof("kind") != "string_value":
+        return None
+    return v.string_value
 
-        return condition
 
-    return unknown
+# Conditions tend to keep the same last transition time across many function
+# runs, so it's cheaper to cache parsed times than to parse them every time.
+@functools.lru_cache(maxsize=1024)
+def _parse_time(ts: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(ts)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Credentials:
     """Credentials."""
 
@@ -156,12 +215,16 @@ class Credentials:
 
 def get_credentials(req: structpb.Struct, name: str) -> Credentials:
     """Get the supplied credentials."""
-    empty = Credentials(type="data", data={})
-    if not req or "credentials" not in req:
-        return empty
-    if not req["credentials"] or name not in req["credentials"]:
-        return empty
+    credentials = req.fields.get("credentials") if req else None
+    value = (
+        credentials.struct_value.fields.get(name) if credentials is not None else None
+    )
+    if value is None:
+        return Credentials(type="data", data={})
+
+    cred = value.struct_value.fields
+    data = cred.get("data")
     return Credentials(
-        type=req["credentials"][name]["type"],
-        data=struct_to_dict(req["credentials"][name]["data"]),
+        type=_get_string(cred, "type") or "data",
+        data=struct_to_dict(data.struct_value) if data is not None else {},
     )
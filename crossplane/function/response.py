@@ -15,6 +15,7 @@
 """Utilities for working with RunFunctionResponses."""
 
 import datetime
+from collections.abc import Iterable
 
 from google.protobuf import duration_pb2 as durationpb
 
@@ -23,6 +24,9 @@ import crossplane.function.proto.v1.run_function_pb2 as fnv1
 """The default TTL for which a RunFunctionResponse may be cached."""
 DEFAULT_TTL = datetime.timedelta(minutes=1)
 
+_DEFAULT_TTL_DURATION = durationpb.Duration()
+_DEFAULT_TTL_DURATION.FromTimedelta(DEFAULT_TTL)
+
 
 def to(
     req: fnv1.RunFunctionRequest,
@@ -40,8 +44,11 @@ def to(
     The request's tag, desired resources, and context is automatically copied to
     the response. Using response.to is a good pattern to ensure
     """
-    dttl = durationpb.Duration()
-    dttl.FromTimedelta(ttl)
+    if ttl == DEFAULT_TTL:
+        dttl = _DEFAULT_TTL_DURATION
+    else:
+        dttl = durationpb.Duration()
+        dttl.FromTimedelta(ttl)
     return fnv1.RunFunctionResponse(
         meta=fnv1.ResponseMeta(tag=req.meta.tag, ttl=dttl),
         desired=req.desired,
@@ -77,3 +84,15 @@ def fatal(rsp: fnv1.RunFunctionResponse, message: str) -> None:
             message=message,
         )
     )
+
+
+def add_results(
+    rsp: fnv1.RunFunctionResponse, results: Iterable[tuple[fnv1.Severity, str]]
+) -> None:
+    """Add several results to the response at once.
+
+    Args:
+        rsp: The response to add results to.
+        results: Pairs of result severity and message.
+    """
+    rsp.results.extend(fnv1.Result(severity=s, message=m) for s, m in results)
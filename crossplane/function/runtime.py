@@ -16,8 +16,12 @@
 
 import asyncio
 import os
+import pathlib
+import signal
+import warnings
 
 import grpc
+from google.protobuf.internal import api_implementation
 from grpc_reflection.v1alpha import reflection
 
 import crossplane.function.proto.v1.run_function_pb2 as fnv1
@@ -25,12 +29,36 @@ import crossplane.function.proto.v1.run_function_pb2_grpc as grpcv1
 import crossplane.function.proto.v1beta1.run_function_pb2 as fnv1beta1
 import crossplane.function.proto.v1beta1.run_function_pb2_grpc as grpcv1beta1
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 SERVICE_NAMES = (
     reflection.SERVICE_NAME,
     fnv1.DESCRIPTOR.services_by_name["FunctionRunnerService"].full_name,
     fnv1beta1.DESCRIPTOR.services_by_name["FunctionRunnerService"].full_name,
 )
 
+# Response compression algorithms, by CROSSPLANE_FN_COMPRESSION value.
+_COMPRESSION = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+# The pure Python protobuf implementation is much slower than the native upb
+# (or cpp) implementations, and is only used if PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION
+# is set to python or no native implementation is available for this platform.
+if api_implementation.Type() == "python":
+    warnings.warn(
+        "Using the pure Python protobuf implementation. Functions will be "
+        "much slower than with the default upb implementation. Unset "
+        "PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION to use upb.",
+        RuntimeWarning,
+        stacklevel=1,
+    )
+
 
 def load_credentials(tls_certs_dir: str) -> grpc.ServerCredentials:
     """Load TLS credentials for a composition function gRPC server.
@@ -48,14 +76,9 @@ def load_credentials(tls_certs_dir: str) -> grpc.ServerCredentials:
     if tls_certs_dir is None:
         return None
 
-    with open(os.path.join(tls_certs_dir, "tls.crt"), "rb") as f:
-        crt = f.read()
-
-    with open(os.path.join(tls_certs_dir, "tls.key"), "rb") as f:
-        key = f.read()
-
-    with open(os.path.join(tls_certs_dir, "ca.crt"), "rb") as f:
-        ca = f.read()
+    crt = pathlib.Path(tls_certs_dir, "tls.crt").read_bytes()
+    key = pathlib.Path(tls_certs_dir, "tls.key").read_bytes()
+    ca = pathlib.Path(tls_certs_dir, "ca.crt").read_bytes()
 
     return grpc.ssl_server_credentials(
         private_key_certificate_chain_pairs=[(key, crt)],
@@ -80,22 +103,20 @@ def serve(
         insecure: Serve insecurely, without credentials or encryption.
 
     Raises:
-        ValueError if creds is None and insecure is False.
+        ValueError if creds is None and insecure is False, or if
+        CROSSPLANE_FN_COMPRESSION is set to an unsupported value.
 
     If insecure is true requests will be served insecurely, even if credentials
     are supplied.
-    """
-    # Define the loop before the server so everything uses the same loop.
-    loop = asyncio.get_event_loop()
-
-    server = grpc.aio.server()
 
-    grpcv1.add_FunctionRunnerServiceServicer_to_server(function, server)
-    grpcv1beta1.add_FunctionRunnerServiceServicer_to_server(
-        BetaFunctionRunner(wrapped=function), server
-    )
-    reflection.enable_server_reflection(SERVICE_NAMES, server)
+    gRPC server reflection is enabled unless the CROSSPLANE_FN_REFLECTION
+    environment variable is set to something other than 1.
 
+    Responses aren't compressed unless the CROSSPLANE_FN_COMPRESSION environment
+    variable is set to gzip or deflate.
+    """
+    # Validate arguments before creating the event loop, so there's nothing to
+    # clean up if they're invalid.
     if creds is None and insecure is False:
         msg = (
             "no credentials were provided - did you provide credentials or use "
@@ -103,19 +124,64 @@ def serve(
         )
         raise ValueError(msg)
 
+    # Don't compress responses by default. Most traffic stays inside the
+    # cluster, where compression's CPU cost usually outweighs its benefit.
+    compression = os.environ.get("CROSSPLANE_FN_COMPRESSION", "none")
+    if compression not in _COMPRESSION:
+        msg = (
+            f"unsupported CROSSPLANE_FN_COMPRESSION {compression!r} - use one of "
+            f"{', '.join(_COMPRESSION)}"
+        )
+        raise ValueError(msg)
+
+    # Define the loop before the server so everything uses the same loop. Use
+    # uvloop if it's installed; it's much faster than the default loop.
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    server = grpc.aio.server(compression=_COMPRESSION[compression])
+
+    grpcv1.add_FunctionRunnerServiceServicer_to_server(function, server)
+    grpcv1beta1.add_FunctionRunnerServiceServicer_to_server(
+        BetaFunctionRunner(wrapped=function), server
+    )
+    if os.environ.get("CROSSPLANE_FN_REFLECTION", "1") == "1":
+        reflection.enable_server_reflection(SERVICE_NAMES, server)
+
     if creds is not None:
         server.add_secure_port(address, creds)
 
     if insecure:
         server.add_insecure_port(address)
 
+    # Stop gracefully when interrupted or terminated. Event loops on Windows
+    # don't support signal handlers; there a KeyboardInterrupt unwinds
+    # run_until_complete and the server is stopped below instead.
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            break
+
     async def start():
         await server.start()
-        await server.wait_for_termination()
+        # Return when signalled, or if the server terminates for another reason.
+        # Cancelling wait_for_termination would cancel the server's shutdown, so
+        # stop the server and let it finish instead.
+        terminated = asyncio.ensure_future(server.wait_for_termination())
+        stopped = asyncio.ensure_future(stop.wait())
+        await asyncio.wait({terminated, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        await server.stop(grace=5)
+        await terminated
 
     try:
         loop.run_until_complete(start())
     finally:
+        # start() stops the server when it returns normally. This only matters if
+        # run_until_complete was interrupted, e.g. by a KeyboardInterrupt on
+        # Windows. Stopping a stopped server is a no-op.
         loop.run_until_complete(server.stop(grace=5))
         loop.close()
 
@@ -137,11 +203,8 @@ class BetaFunctionRunner(grpcv1beta1.FunctionRunnerService):
         self, req: fnv1beta1.RunFunctionRequest, context: grpc.aio.ServicerContext
     ) -> fnv1beta1.RunFunctionResponse:
         """Run the underlying function."""
-        gareq = fnv1.RunFunctionRequest()
-        gareq.ParseFromString(req.SerializeToString())
-
+        gareq = fnv1.RunFunctionRequest.FromString(req.SerializePartialToString())
         garsp = await self.wrapped.RunFunction(gareq, context)
-        rsp = fnv1beta1.RunFunctionResponse()
-        rsp.ParseFromString(garsp.SerializeToString())
-
-        return rsp
+        return fnv1beta1.RunFunctionResponse.FromString(
+            garsp.SerializePartialToString()
+        )
@@ -0,0 +1,96 @@
+# Copyright 2023 The Crossplane Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import dataclasses
+import importlib
+import io
+import json
+import sys
+import unittest
+from unittest import mock
+
+from crossplane.function import logging
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class ProductionCase:
+    reason: str
+    kw: dict
+    want: dict
+
+
+@contextlib.contextmanager
+def _without_orjson():
+    # Reload the logging module as if orjson weren't installed, so it picks the
+    # stdlib json renderer. Reload it again afterwards to restore it.
+    try:
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            importlib.reload(logging)
+        yield
+    finally:
+        importlib.reload(logging)
+
+
+def _log_info(kw: dict) -> dict:
+    # Loggers write to stdout, which is looked up when they're first used.
+    # Capture it as bytes, since the orjson renderer writes to stdout's buffer.
+    buf = io.BytesIO()
+    out = io.TextIOWrapper(buf, write_through=True)
+    with contextlib.redirect_stdout(out):
+        logging.get_logger().info("hi", **kw)
+    return json.loads(buf.getvalue())
+
+
+def tearDownModule() -> None:
+    logging.configure(level=logging.Level.DISABLED)
+
+
+class TestLogging(unittest.TestCase):
+    def test_configure_production(self) -> None:
+        cases = [
+            ProductionCase(
+                reason="String keys and values should be rendered as JSON.",
+                kw={"cool-key": "cool-value"},
+                want={"level": "info", "msg": "hi", "cool-key": "cool-value"},
+            ),
+            ProductionCase(
+                reason="Non-string dict keys should be rendered as strings.",
+                kw={"d": {1: "a"}},
+                want={"level": "info", "msg": "hi", "d": {"1": "a"}},
+            ),
+            ProductionCase(
+                reason="Integers that don't fit in 64 bits should still render.",
+                kw={"n": 2**70},
+                want={"level": "info", "msg": "hi", "n": 2**70},
+            ),
+        ]
+
+        renderers = {"json": _without_orjson}
+        if logging.orjson is not None:
+            renderers["orjson"] = contextlib.nullcontext
+
+        for renderer, ctx in renderers.items():
+            with ctx():
+                logging.configure(level=logging.Level.INFO)
+                for case in cases:
+                    with self.subTest(renderer=renderer, reason=case.reason):
+                        got = _log_info(case.kw)
+                        self.assertIn("ts", got)
+                        del got["ts"]
+                        self.assertEqual(case.want, got, "-want, +got")
+
+
+if __name__ == "__main__":
+    unittest.main()
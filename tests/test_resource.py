@@ -17,44 +17,159 @@ import datetime
 import unittest
 
 import pydantic
-from google.protobuf import json_format
 from google.protobuf import struct_pb2 as structpb
 
 import crossplane.function.proto.v1.run_function_pb2 as fnv1
 from crossplane.function import logging, resource
 from tests.testdata.models.io.upbound.aws.s3 import v1beta2
 
+# Structs that tests only read. They're built once at import time rather than
+# every time a test runs.
+_EMPTY = resource.dict_to_struct({})
 
-class TestResource(unittest.TestCase):
-    def setUp(self) -> None:
-        logging.configure(level=logging.Level.DISABLED)
+# A minimal resource. Tests that update a resource should copy it.
+_EXAMPLE = fnv1.Resource(
+    resource=resource.dict_to_struct({"apiVersion": "example.org", "kind": "Resource"})
+)
+
+_BUCKET = v1beta2.Bucket(
+    spec=v1beta2.Spec(
+        forProvider=v1beta2.ForProvider(region="us-west-2"),
+    ),
+)
+
+_NO_CONDITIONS = resource.dict_to_struct({"status": {}})
+
+_COOL_CONDITION = resource.dict_to_struct(
+    {
+        "status": {
+            "conditions": [
+                {
+                    "type": "Cool",
+                    "status": "True",
+                }
+            ]
+        }
+    }
+)
+
+_MINIMAL_READY_CONDITION = resource.dict_to_struct(
+    {
+        "status": {
+            "conditions": [
+                {
+                    "type": "Ready",
+                    "status": "True",
+                }
+            ]
+        }
+    }
+)
+
+_FULL_READY_CONDITION = resource.dict_to_struct(
+    {
+        "status": {
+            "conditions": [
+                {
+                    "type": "Ready",
+                    "status": "True",
+                    "reason": "Cool",
+                    "message": "This condition is very cool",
+                    "lastTransitionTime": "2023-10-02T16:30:00Z",
+                }
+            ]
+        }
+    }
+)
+
+_STRING_STATUS = resource.dict_to_struct({"status": "cool"})
+
+_STRING_CONDITIONS = resource.dict_to_struct({"status": {"conditions": "cool"}})
+
+_NO_STATUS_READY_CONDITION = resource.dict_to_struct(
+    {"status": {"conditions": [{"type": "Ready"}]}}
+)
+
+_NON_STRING_READY_CONDITION = resource.dict_to_struct(
+    {
+        "status": {
+            "conditions": [
+                {
+                    "type": "Ready",
+                    "status": "False",
+                    "reason": 42,
+                    "message": {"very": "cool"},
+                }
+            ]
+        }
+    }
+)
+
+# The lastTransitionTime of _FULL_READY_CONDITION.
+_TRANSITION_TIME = datetime.datetime(2023, 10, 2, 16, 30, tzinfo=datetime.UTC)
+
+_UNKNOWN_READY = resource.Condition(typ="Ready", status="Unknown")
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class AddCase:
+    reason: str
+    r: fnv1.Resource
+    source: dict | structpb.Struct | pydantic.BaseModel
+    want: fnv1.Resource
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class ConditionCase:
+    reason: str
+    res: structpb.Struct
+    typ: str
+    want: resource.Condition
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class CredentialsCase:
+    reason: str
+    req: structpb.Struct
+    name: str
+    want: resource.Credentials
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class DictToStructCase:
+    reason: str
+    d: dict
 
-    def test_add(self) -> None:
-        @dataclasses.dataclass
-        class TestCase:
-            reason: str
-            r: fnv1.Resource
-            source: dict | structpb.Struct | pydantic.BaseModel
-            want: fnv1.Resource
 
+@dataclasses.dataclass(slots=True, frozen=True)
+class StructToDictCase:
+    reason: str
+    s: structpb.Struct
+    want: dict
+
+
+def _copy(r: fnv1.Resource) -> fnv1.Resource:
+    c = fnv1.Resource()
+    c.CopyFrom(r)
+    return c
+
+
+def setUpModule() -> None:
+    logging.configure(level=logging.Level.DISABLED)
+
+
+class TestResource(unittest.TestCase):
+    def test_add(self) -> None:
         cases = [
-            TestCase(
+            AddCase(
                 reason="Updating from a dict should work.",
                 r=fnv1.Resource(),
                 source={"apiVersion": "example.org", "kind": "Resource"},
-                want=fnv1.Resource(
-                    resource=resource.dict_to_struct(
-                        {"apiVersion": "example.org", "kind": "Resource"}
-                    ),
-                ),
+                want=_EXAMPLE,
             ),
-            TestCase(
+            AddCase(
                 reason="Updating an existing resource from a dict should work.",
-                r=fnv1.Resource(
-                    resource=resource.dict_to_struct(
-                        {"apiVersion": "example.org", "kind": "Resource"}
-                    ),
-                ),
+                r=_copy(_EXAMPLE),
                 source={
                     "metadata": {"name": "cool"},
                 },
@@ -68,26 +183,16 @@ class TestResource(unittest.TestCase):
                     ),
                 ),
             ),
-            TestCase(
+            AddCase(
                 reason="Updating from a struct should work.",
                 r=fnv1.Resource(),
-                source=resource.dict_to_struct(
-                    {"apiVersion": "example.org", "kind": "Resource"}
-                ),
-                want=fnv1.Resource(
-                    resource=resource.dict_to_struct(
-                        {"apiVersion": "example.org", "kind": "Resource"}
-                    ),
-                ),
+                source=_EXAMPLE.resource,
+                want=_EXAMPLE,
             ),
-            TestCase(
+            AddCase(
                 reason="Updating from a Pydantic model should work.",
                 r=fnv1.Resource(),
-                source=v1beta2.Bucket(
-                    spec=v1beta2.Spec(
-                        forProvider=v1beta2.ForProvider(region="us-west-2"),
-                    ),
-                ),
+                source=_BUCKET,
                 want=fnv1.Resource(
                     resource=resource.dict_to_struct(
                         {
@@ -101,120 +206,85 @@ class TestResource(unittest.TestCase):
         ]
 
         for case in cases:
-            resource.update(case.r, case.source)
-            self.assertEqual(
-                json_format.MessageToDict(case.want),
-                json_format.MessageToDict(case.r),
-                "-want, +got",
-            )
+            with self.subTest(reason=case.reason):
+                resource.update(case.r, case.source)
+                self.assertEqual(case.want, case.r, "-want, +got")
 
     def test_get_condition(self) -> None:
-        @dataclasses.dataclass
-        class TestCase:
-            reason: str
-            res: structpb.Struct
-            typ: str
-            want: resource.Condition
-
         cases = [
-            TestCase(
+            ConditionCase(
                 reason="Return an unknown condition if the resource has no status.",
-                res=resource.dict_to_struct({}),
+                res=_EMPTY,
                 typ="Ready",
-                want=resource.Condition(typ="Ready", status="Unknown"),
+                want=_UNKNOWN_READY,
             ),
-            TestCase(
+            ConditionCase(
                 reason="Return an unknown condition if the resource has no conditions.",
-                res=resource.dict_to_struct({"status": {}}),
+                res=_NO_CONDITIONS,
                 typ="Ready",
-                want=resource.Condition(typ="Ready", status="Unknown"),
+                want=_UNKNOWN_READY,
             ),
-            TestCase(
+            ConditionCase(
                 reason="Return an unknown condition if the resource does not have the "
                 "requested type of condition.",
-                res=resource.dict_to_struct(
-                    {
-                        "status": {
-                            "conditions": [
-                                {
-                                    "type": "Cool",
-                                    "status": "True",
-                                }
-                            ]
-                        }
-                    }
-                ),
+                res=_COOL_CONDITION,
                 typ="Ready",
-                want=resource.Condition(typ="Ready", status="Unknown"),
+                want=_UNKNOWN_READY,
             ),
-            TestCase(
+            ConditionCase(
+                reason="Return an unknown condition if the resource's status is not "
+                "an object.",
+                res=_STRING_STATUS,
+                typ="Ready",
+                want=_UNKNOWN_READY,
+            ),
+            ConditionCase(
+                reason="Return an unknown condition if the resource's conditions are "
+                "not a list.",
+                res=_STRING_CONDITIONS,
+                typ="Ready",
+                want=_UNKNOWN_READY,
+            ),
+            ConditionCase(
+                reason="Return an unknown status if the condition has no status.",
+                res=_NO_STATUS_READY_CONDITION,
+                typ="Ready",
+                want=_UNKNOWN_READY,
+            ),
+            ConditionCase(
+                reason="Ignore a reason or message that is not a string.",
+                res=_NON_STRING_READY_CONDITION,
+                typ="Ready",
+                want=resource.Condition(typ="Ready", status="False"),
+            ),
+            ConditionCase(
                 reason="Return a minimal condition if it exists.",
-                res=resource.dict_to_struct(
-                    {
-                        "status": {
-                            "conditions": [
-                                {
-                                    "type": "Ready",
-                                    "status": "True",
-                                }
-                            ]
-                        }
-                    }
-                ),
+                res=_MINIMAL_READY_CONDITION,
                 typ="Ready",
                 want=resource.Condition(typ="Ready", status="True"),
             ),
-            TestCase(
+            ConditionCase(
                 reason="Return a full condition if it exists.",
-                res=resource.dict_to_struct(
-                    {
-                        "status": {
-                            "conditions": [
-                                {
-                                    "type": "Ready",
-                                    "status": "True",
-                                    "reason": "Cool",
-                                    "message": "This condition is very cool",
-                                    "lastTransitionTime": "2023-10-02T16:30:00Z",
-                                }
-                            ]
-                        }
-                    }
-                ),
+                res=_FULL_READY_CONDITION,
                 typ="Ready",
                 want=resource.Condition(
                     typ="Ready",
                     status="True",
                     reason="Cool",
                     message="This condition is very cool",
-                    last_transition_time=datetime.datetime(
-                        year=2023,
-                        month=10,
-                        day=2,
-                        hour=16,
-                        minute=30,
-                        tzinfo=datetime.UTC,
-                    ),
+                    last_transition_time=_TRANSITION_TIME,
                 ),
             ),
         ]
 
         for case in cases:
-            got = resource.get_condition(case.res, case.typ)
-            self.assertEqual(
-                dataclasses.asdict(case.want), dataclasses.asdict(got), "-want, +got"
-            )
+            with self.subTest(reason=case.reason):
+                got = resource.get_condition(case.res, case.typ)
+                self.assertEqual(case.want, got, "-want, +got")
 
     def test_get_credentials(self) -> None:
-        @dataclasses.dataclass
-        class TestCase:
-            reason: str
-            req: structpb.Struct
-            name: str
-            want: resource.Credentials
-
         cases = [
-            TestCase(
+            CredentialsCase(
                 reason="Return the specified credentials if they exist.",
                 req=resource.dict_to_struct(
                     {"credentials": {"test": {"type": "data", "data": {"foo": "bar"}}}}
@@ -222,13 +292,13 @@ class TestResource(unittest.TestCase):
                 name="test",
                 want=resource.Credentials(type="data", data={"foo": "bar"}),
             ),
-            TestCase(
+            CredentialsCase(
                 reason="Return empty credentials if no credentials section exists.",
-                req=resource.dict_to_struct({}),
+                req=_EMPTY,
                 name="test",
                 want=resource.Credentials(type="data", data={}),
             ),
-            TestCase(
+            CredentialsCase(
                 reason="Return empty credentials if the specified name does not exist.",
                 req=resource.dict_to_struct(
                     {
@@ -240,33 +310,82 @@ class TestResource(unittest.TestCase):
                 name="test",
                 want=resource.Credentials(type="data", data={}),
             ),
+            CredentialsCase(
+                reason="Return empty data credentials if the specified credentials "
+                "have no type or data.",
+                req=resource.dict_to_struct({"credentials": {"test": {}}}),
+                name="test",
+                want=resource.Credentials(type="data", data={}),
+            ),
         ]
 
         for case in cases:
-            got = resource.get_credentials(case.req, case.name)
-            self.assertEqual(
-                dataclasses.asdict(case.want), dataclasses.asdict(got), "-want, +got"
-            )
+            with self.subTest(reason=case.reason):
+                got = resource.get_credentials(case.req, case.name)
+                self.assertEqual(case.want, got, "-want, +got")
 
-    def test_struct_to_dict(self) -> None:
-        @dataclasses.dataclass
-        class TestCase:
-            reason: str
-            s: structpb.Struct
-            want: dict
+    def test_dict_to_struct(self) -> None:
+        # dict_to_struct should always produce the same Struct as Struct.update.
+        cases = [
+            DictToStructCase(
+                reason="Convert an empty dictionary.",
+                d={},
+            ),
+            DictToStructCase(
+                reason="Convert a dictionary of scalars.",
+                d={"s": "a", "i": 1, "f": 1.5, "b": True, "n": None},
+            ),
+            DictToStructCase(
+                reason="Convert empty nested dictionaries and lists.",
+                d={"d": {}, "l": [], "nested": {"d": {}, "l": []}},
+            ),
+            DictToStructCase(
+                reason="Convert a list of strings.",
+                d={"l": ["a", "b", "c"]},
+            ),
+            DictToStructCase(
+                reason="Convert a list of mixed ints and floats.",
+                d={"l": [1, 2.5, -3, 0.0]},
+            ),
+            DictToStructCase(
+                reason="Convert a list of bools and ints, keeping bools as bools.",
+                d={"l": [1, True, 2, False], "b": [True, False]},
+            ),
+            DictToStructCase(
+                reason="Convert a list that starts with a string but isn't all "
+                "strings.",
+                d={"l": ["a", 1, None]},
+            ),
+            DictToStructCase(
+                reason="Convert tuples like lists.",
+                d={"t": ("a", "b"), "l": [(1, 2), ()]},
+            ),
+            DictToStructCase(
+                reason="Convert empty and non-empty dicts and lists inside lists.",
+                d={"l": [{}, [], {"a": ["b"]}, [[1, 2], ["c"]], None]},
+            ),
+        ]
 
+        for case in cases:
+            with self.subTest(reason=case.reason):
+                want = structpb.Struct()
+                want.update(case.d)
+                got = resource.dict_to_struct(case.d)
+                self.assertEqual(want, got, "-want, +got")
+
+    def test_struct_to_dict(self) -> None:
         cases = [
-            TestCase(
+            StructToDictCase(
                 reason="Convert a struct with no fields to an empty dictionary.",
                 s=structpb.Struct(),
                 want={},
             ),
-            TestCase(
+            StructToDictCase(
                 reason="Convert a struct with a single field to a dictionary.",
                 s=structpb.Struct(fields={"foo": structpb.Value(string_value="bar")}),
                 want={"foo": "bar"},
             ),
-            TestCase(
+            StructToDictCase(
                 reason="Convert a nested struct to a dictionary.",
                 s=structpb.Struct(
                     fields={
@@ -282,8 +401,9 @@ class TestResource(unittest.TestCase):
         ]
 
         for case in cases:
-            got = resource.struct_to_dict(case.s)
-            self.assertEqual(case.want, got, "-want, +got")
+            with self.subTest(reason=case.reason):
+                got = resource.struct_to_dict(case.s)
+                self.assertEqual(case.want, got, "-want, +got")
 
 
 if __name__ == "__main__":
@@ -17,58 +17,100 @@ import datetime
 import unittest
 
 from google.protobuf import duration_pb2 as durationpb
-from google.protobuf import json_format
 
 from crossplane.function import logging, resource, response
 from crossplane.function.proto.v1 import run_function_pb2 as fnv1
 
+# A context and desired state that tests only read. They're built once at
+# import time rather than every time a test runs.
+_CONTEXT = resource.dict_to_struct({"cool-key": "cool-value"})
+_DESIRED = fnv1.State(resources={"ready-composed-resource": fnv1.Resource()})
 
-class TestResponse(unittest.TestCase):
-    def setUp(self) -> None:
-        logging.configure(level=logging.Level.DISABLED)
 
-    def test_to(self) -> None:
-        @dataclasses.dataclass
-        class TestCase:
-            reason: str
-            req: fnv1.RunFunctionRequest
-            ttl: datetime.timedelta
-            want: fnv1.RunFunctionResponse
+@dataclasses.dataclass(slots=True, frozen=True)
+class ToCase:
+    reason: str
+    req: fnv1.RunFunctionRequest
+    ttl: datetime.timedelta
+    want: fnv1.RunFunctionResponse
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class AddResultsCase:
+    reason: str
+    results: list[tuple[fnv1.Severity, str]]
+    want: fnv1.RunFunctionResponse
+
+
+def setUpModule() -> None:
+    logging.configure(level=logging.Level.DISABLED)
 
+
+class TestResponse(unittest.TestCase):
+    def test_to(self) -> None:
         cases = [
-            TestCase(
+            ToCase(
                 reason="Tag, desired, and context should be copied.",
                 req=fnv1.RunFunctionRequest(
                     meta=fnv1.RequestMeta(tag="hi"),
-                    desired=fnv1.State(
-                        resources={
-                            "ready-composed-resource": fnv1.Resource(),
-                        }
-                    ),
-                    context=resource.dict_to_struct({"cool-key": "cool-value"}),
+                    desired=_DESIRED,
+                    context=_CONTEXT,
                 ),
                 ttl=datetime.timedelta(minutes=10),
                 want=fnv1.RunFunctionResponse(
                     meta=fnv1.ResponseMeta(
                         tag="hi", ttl=durationpb.Duration(seconds=60 * 10)
                     ),
-                    desired=fnv1.State(
-                        resources={
-                            "ready-composed-resource": fnv1.Resource(),
-                        }
+                    desired=_DESIRED,
+                    context=_CONTEXT,
+                ),
+            ),
+            ToCase(
+                reason="The default TTL should be used if none is supplied.",
+                req=fnv1.RunFunctionRequest(meta=fnv1.RequestMeta(tag="hi")),
+                ttl=response.DEFAULT_TTL,
+                want=fnv1.RunFunctionResponse(
+                    meta=fnv1.ResponseMeta(
+                        tag="hi", ttl=durationpb.Duration(seconds=60)
                     ),
-                    context=resource.dict_to_struct({"cool-key": "cool-value"}),
+                    desired=fnv1.State(),
+                    context=resource.dict_to_struct({}),
+                ),
+            ),
+        ]
+
+        for case in cases:
+            with self.subTest(reason=case.reason):
+                got = response.to(case.req, case.ttl)
+                self.assertEqual(case.want, got, "-want, +got")
+
+    def test_add_results(self) -> None:
+        cases = [
+            AddResultsCase(
+                reason="No results should be added if none are supplied.",
+                results=[],
+                want=fnv1.RunFunctionResponse(),
+            ),
+            AddResultsCase(
+                reason="Results should be added in order.",
+                results=[
+                    (fnv1.SEVERITY_NORMAL, "cool"),
+                    (fnv1.SEVERITY_FATAL, "not cool"),
+                ],
+                want=fnv1.RunFunctionResponse(
+                    results=[
+                        fnv1.Result(severity=fnv1.SEVERITY_NORMAL, message="cool"),
+                        fnv1.Result(severity=fnv1.SEVERITY_FATAL, message="not cool"),
+                    ]
                 ),
             ),
         ]
 
         for case in cases:
-            got = response.to(case.req, case.ttl)
-            self.assertEqual(
-                json_format.MessageToJson(case.want),
-                json_format.MessageToJson(got),
-                "-want, +got",
-            )
+            with self.subTest(reason=case.reason):
+                got = fnv1.RunFunctionResponse()
+                response.add_results(got, case.results)
+                self.assertEqual(case.want, got, "-want, +got")
 
 
 if __name__ == "__main__":
@@ -23,22 +23,26 @@ import crossplane.function.proto.v1beta1.run_function_pb2 as fnv1beta1
 from crossplane.function import logging, runtime
 
 
+@dataclasses.dataclass(slots=True, frozen=True)
+class RunFunctionCase:
+    reason: str
+    req: fnv1beta1.RunFunctionRequest
+    want: fnv1beta1.RunFunctionResponse
+
+
+def setUpModule() -> None:
+    logging.configure(level=logging.Level.DISABLED)
+
+
 class TestRuntime(unittest.IsolatedAsyncioTestCase):
-    def setUp(self) -> None:
-        logging.configure(level=logging.Level.DISABLED)
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.beta_runner = runtime.BetaFunctionRunner(wrapped=EchoRunner())
 
     async def test_run_function(self) -> None:
-        @dataclasses.dataclass
-        class TestCase:
-            reason: str
-            runner: grpcv1.FunctionRunnerService
-            req: fnv1beta1.RunFunctionRequest
-            want: fnv1beta1.RunFunctionResponse
-
         cases = [
-            TestCase(
+            RunFunctionCase(
                 reason="The v1 response should be returned as a v1beta1 response.",
-                runner=EchoRunner(),
                 req=fnv1beta1.RunFunctionRequest(meta=fnv1beta1.RequestMeta(tag="hi")),
                 want=fnv1beta1.RunFunctionResponse(
                     meta=fnv1beta1.ResponseMeta(tag="hi")
@@ -47,10 +51,10 @@ class TestRuntime(unittest.IsolatedAsyncioTestCase):
         ]
 
         for case in cases:
-            beta_runner = runtime.BetaFunctionRunner(wrapped=case.runner)
-            rsp = await beta_runner.RunFunction(case.req, None)
+            with self.subTest(reason=case.reason):
+                rsp = await self.beta_runner.RunFunction(case.req, None)
 
-            self.assertEqual(rsp, case.want, "-want, +got")
+                self.assertEqual(rsp, case.want, "-want, +got")
 
 
 class EchoRunner(grpcv1.FunctionRunnerService):